@@ -1,5 +1,6 @@
 #!/bin/bash
 export DOCKER_BUILDKIT=1 
 docker build -t yosshi999/vvengine-gcp --target runtime-env .
+# docker build -t yosshi999/vvengine-gcp:int8 --target runtime-int8-env .
 
 # us-central1-docker.pkg.dev/voicevox-gcr/voicevox/vvengine
\ No newline at end of file
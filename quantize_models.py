@@ -0,0 +1,49 @@
+# Writes a copy of a voicevox_core model directory with the MatMul weights of
+# every ONNX model dynamically quantized to INT8. Non-ONNX files (metas.json
+# etc.) are copied as is. Every written model is opened with ONNX Runtime so
+# that a graph the CPU provider cannot run fails here instead of at startup.
+import argparse
+from pathlib import Path
+import shutil
+
+import onnxruntime
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+# Conv is left in FP32: with QInt8 weights it becomes ConvInteger, which ONNX
+# Runtime's CPU provider only implements for uint8 weights.
+OP_TYPES_TO_QUANTIZE = ["MatMul"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("src", type=Path, help="voicevox_core model directory")
+    parser.add_argument("dst", type=Path, help="output directory")
+    parser.add_argument(
+        "--reduce-range",
+        action="store_true",
+        help="quantize weights to 7 bits. Use for CPUs without AVX512-VNNI, "
+        "where 8-bit u8s8 products can saturate.",
+    )
+    args = parser.parse_args()
+
+    args.dst.mkdir(parents=True, exist_ok=True)
+    for path in sorted(args.src.iterdir()):
+        if path.suffix == ".onnx":
+            print("quantizing", path.name)
+            quantize_dynamic(
+                path,
+                args.dst / path.name,
+                op_types_to_quantize=OP_TYPES_TO_QUANTIZE,
+                per_channel=True,
+                reduce_range=args.reduce_range,
+                weight_type=QuantType.QInt8,
+            )
+            onnxruntime.InferenceSession(
+                str(args.dst / path.name), providers=["CPUExecutionProvider"]
+            )
+        elif path.is_file():
+            shutil.copy2(path, args.dst / path.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,349 @@
-from dataclasses import dataclass
+import array
+import asyncio
+import bisect
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+import copy
+from dataclasses import asdict, dataclass
+import io
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryFile
+import queue
+import sys
 import time
-from typing import Optional
+from typing import Deque, Dict, List, Literal, Optional, Set, Tuple
+import wave
 
-from omegaconf import OmegaConf
+import soundfile
 import uvicorn
-from fastapi import FastAPI, HTTPException, Response
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from starlette.responses import FileResponse
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 
-from voicevox_core import AccelerationMode, VoicevoxCore
+
+# ONNX Runtime sizes its pools from the host's cores, which oversubscribes
+# a container limited by CPU affinity or a cgroup quota.
+def available_cpus() -> int:
+    n = len(os.sched_getaffinity(0))
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        n = min(n, quota)
+    return n
+
+
+# Returns the whole CPUs granted by the cgroup CPU quota, or None without one.
+def cgroup_cpu_quota() -> Optional[int]:
+    try:
+        # cgroup v2: "<quota> <period>", quota "max" when unlimited
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota == "max":
+            return None
+        return max(1, int(quota) // int(period))
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: quota -1 when unlimited
+        quota = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us").read_text())
+        period = int(Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us").read_text())
+        if quota <= 0:
+            return None
+        return max(1, quota // period)
+    except (OSError, ValueError):
+        return None
+
+
+# OpenMP reads these once, when its runtime is loaded, so they have to be set
+# before voicevox_core (and with it ONNX Runtime) is imported.
+os.environ.setdefault("OMP_NUM_THREADS", str(int(os.environ.get("THREADS", 0)) or available_cpus()))
+os.environ.setdefault("OMP_WAIT_POLICY", "PASSIVE")
+
+from voicevox_core import AccelerationMode, AudioQuery, VoicevoxCore
+
+
+def getenv_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
 
 
 @dataclass
 class AppConfig:
     uvicorn_host: str = "0.0.0.0"
-    uvicorn_port: int = os.environ.get("PORT", 50021)
+    uvicorn_port: int = int(os.environ.get("PORT", 50021))
+    uvicorn_loop: str = os.environ.get("UVICORN_LOOP", "auto")
+    uvicorn_http: str = os.environ.get("UVICORN_HTTP", "auto")
 
     open_jtalk_dict_dir: str = "/opt/voicevox_engine/dic/open_jtalk_dic_utf_8-1.11"
-    # The number of threads for ONNX Runtime. Default value 0 means AUTO.
-    threads: int = os.environ.get("THREADS", 0)
-    base_speed_scale: float = os.environ.get("BASE_SPEED_SCALE", 1.0)
-    volume_scale: float = os.environ.get("VOLUME_SCALE", 1.2)
-    pre_phoneme_length: float = os.environ.get("PRE_PHONEME_LENGTH", 0.15)
-    post_phoneme_length: float = os.environ.get("POST_PHONEME_LENGTH", 0.1)
+    # "int8_vnni" or "int8_avx2" loads the INT8 models baked into the
+    # runtime-int8-env image instead of the FP32 ones bundled with voicevox_core.
+    quant_mode: str = os.environ.get("VV_QUANT", "")
+    quant_model_root: str = "/opt/voicevox_engine"
+    # ONNX Runtime execution provider: "AUTO", "CPU" or "GPU".
+    acceleration_mode: str = os.environ.get("ACCELERATION_MODE", "AUTO")
+    # The number of threads for ONNX Runtime. Default value 0 means the number
+    # of CPUs available to this container (affinity and cgroup quota). Unlike
+    # ONNX Runtime's own default of one thread per physical core, that counts
+    # logical CPUs, so on SMT hosts set THREADS to the physical core count.
+    threads: int = int(os.environ.get("THREADS", 0))
+    base_speed_scale: float = float(os.environ.get("BASE_SPEED_SCALE", 1.0))
+    volume_scale: float = float(os.environ.get("VOLUME_SCALE", 1.2))
+    pre_phoneme_length: float = float(os.environ.get("PRE_PHONEME_LENGTH", 0.15))
+    post_phoneme_length: float = float(os.environ.get("POST_PHONEME_LENGTH", 0.1))
+    # The most queued queries of one mora bucket submitted to the executor
+    # by a single flush. It only sets scheduling order; nothing waits for a
+    # batch to fill and voicevox_core synthesizes each query on its own.
+    max_batch: int = int(os.environ.get("MAX_BATCH", 8))
+    # Texts longer than this are rejected with 413 before OpenJTalk runs.
+    max_text_length: int = int(os.environ.get("MAX_TEXT_LENGTH", 600))
+    # Queries with more moras than this are rejected with 413 before synthesis.
+    max_moras: int = int(os.environ.get("MAX_MORAS", 600))
+    # The number of audio queries kept in the LRU cache. 0 disables caching.
+    query_cache_size: int = int(os.environ.get("QUERY_CACHE_SIZE", 4096))
+    # The number of /tts requests running inference at once. 0 means max_batch.
+    max_concurrency: int = int(os.environ.get("MAX_CONCURRENCY", 0))
+    # The number of /tts requests allowed to wait for an inference slot.
+    # Requests beyond that are rejected with 503.
+    max_queue: int = int(os.environ.get("MAX_QUEUE", 64))
+    # Run one synthesis per listed speaker (comma separated, or "all" for
+    # every loaded style) at startup so the first request does not pay
+    # ONNX Runtime's first-run cost.
+    warmup: bool = getenv_bool("WARMUP", True)
+    warmup_speakers: str = os.environ.get("WARMUP_SPEAKERS", "0")
+    # Emit the per-request PERF line (mora count, speech length, timing).
+    verbose_perf: bool = getenv_bool("VERBOSE_PERF", True)
+    log_level: str = os.environ.get("LOG_LEVEL", "INFO")
+
+    def __post_init__(self):
+        if self.max_batch < 1:
+            raise ValueError(f"MAX_BATCH must be at least 1, got {self.max_batch}")
+        if self.max_concurrency < 0:
+            raise ValueError(f"MAX_CONCURRENCY must not be negative, got {self.max_concurrency}")
+
+logger = logging.getLogger("tts")
 
 class TTSRequest(BaseModel):
-    text: str
-    speaker: int
-    speed: float = 1.0
+    text: str = Field(..., min_length=1)
+    speaker: int = Field(..., ge=0)
+    speed: float = Field(1.0, gt=0.1, le=4.0)
+    # "pcm" returns raw 16-bit samples (audio/L16) without the WAV container.
+    # When omitted, the format is picked from the Accept header.
+    format: Optional[Literal["wav", "pcm", "flac", "opus"]] = None
+
+# LRU cache of audio_query results keyed by (speaker, text). It is only used
+# from the event loop, so hits never queue behind syntheses in the pool.
+# Queries are shallow-copied in and out: tts() only overwrites top-level
+# scale and length fields, and the accent phrases are shared read-only.
+class AudioQueryCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.cache: "OrderedDict[Tuple[int, str], AudioQuery]" = OrderedDict()
+
+    def get(self, text: str, speaker: int) -> Optional[AudioQuery]:
+        key = (speaker, text)
+        query = self.cache.get(key)
+        if query is None:
+            return None
+        self.cache.move_to_end(key)
+        return copy.copy(query)
+
+    def put(self, text: str, speaker: int, query: AudioQuery):
+        if self.maxsize <= 0:
+            return
+        self.cache[(speaker, text)] = copy.copy(query)
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+
+
+# Returns the number of moras in the query.
+def count_moras(query: AudioQuery) -> int:
+    return sum(len(phrase.moras) for phrase in query.accent_phrases)
+
+
+# Upper mora-count bounds of the synthesis buckets; longer queries share the last one.
+BUCKET_BOUNDS = (16, 32, 64)
+
+
+# Coalesces concurrent synthesis requests into batches.
+# voicevox_core has no batched decode, so each query is its own executor job
+# and its future is resolved as soon as that job returns; a batch runs on as
+# many workers as the pool has, whatever its speakers. Nothing waits for a
+# batch to fill: a bucket is flushed as soon as its previous flush is done,
+# so a batch is whatever queued up behind it.
+# Queries are bucketed by mora count and each bucket is flushed by its own
+# task with at most `workers` jobs in the executor at a time, so a short
+# utterance is interleaved with a long bucket's batch instead of queueing
+# behind all of it.
+class SynthesisBatcher:
+    def __init__(self, core: VoicevoxCore, executor: Executor, workers: int, max_batch: int):
+        self.core = core
+        self.executor = executor
+        self.workers = workers
+        self.max_batch = max_batch
+        self.buckets: List[Deque[Tuple[AudioQuery, int, asyncio.Future]]] = [
+            deque() for _ in range(len(BUCKET_BOUNDS) + 1)
+        ]
+        self.flushing: Set[int] = set()
+        self.tasks: Set[asyncio.Task] = set()
+        self.wakeup = asyncio.Event()
+
+    async def synthesis(self, query: AudioQuery, speaker: int) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        bucket = self.buckets[bisect.bisect_left(BUCKET_BOUNDS, count_moras(query))]
+        bucket.append((query, speaker, future))
+        self.wakeup.set()
+        return await future
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            for i, bucket in enumerate(self.buckets):
+                if not bucket or i in self.flushing:
+                    continue
+                # marked before the task starts so the next pass skips this bucket
+                self.flushing.add(i)
+                task = asyncio.create_task(self._flush(i))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+            await self.wakeup.wait()
+
+    async def _flush(self, i: int):
+        bucket = self.buckets[i]
+        batch = [bucket.popleft() for _ in range(min(len(bucket), self.max_batch))]
+        limit = asyncio.Semaphore(self.workers)
+        try:
+            await asyncio.gather(
+                *(self._synthesis_one(limit, query, speaker, future) for query, speaker, future in batch)
+            )
+        except Exception as e:
+            # never leave a request waiting on a future nobody will resolve
+            logger.exception("synthesis flush failed")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.flushing.discard(i)
+            self.wakeup.set()
+
+    async def _synthesis_one(self, limit: asyncio.Semaphore, query: AudioQuery, speaker: int, future: asyncio.Future):
+        loop = asyncio.get_running_loop()
+        try:
+            async with limit:
+                result = await loop.run_in_executor(self.executor, self.core.synthesis, query, speaker)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+
+# Returns (the number of moras, the speech length in seconds) of the query.
+def query_stats(query: AudioQuery) -> Tuple[int, float]:
+    speech_length = query.pre_phoneme_length + query.post_phoneme_length + sum(
+        (m.consonant_length or 0.0) + (m.vowel_length or 0.0)
+        for phrase in query.accent_phrases for m in phrase.moras
+    )
+    return count_moras(query), speech_length / query.speed_scale
 
-def b64encode_str(s):
-    return base64.b64encode(s).decode("utf-8")
+
+# Returns (sampling rate, channels, big-endian samples) of a 16-bit PCM WAV
+# as audio/L16 (RFC 2586) requires network byte order.
+def wav_to_l16(wav_bytes: bytes) -> Tuple[int, int, bytes]:
+    with wave.open(io.BytesIO(wav_bytes)) as w:
+        rate, channels = w.getframerate(), w.getnchannels()
+        samples = array.array("h", w.readframes(w.getnframes()))
+    if sys.byteorder == "little":
+        samples.byteswap()
+    return rate, channels, samples.tobytes()
+
+
+ACCEPT_FORMATS = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/flac": "flac",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+}
+MEDIA_TYPES = {"flac": "audio/flac", "opus": "audio/ogg; codecs=opus"}
+
+
+# Picks the first audio format listed in the Accept header, WAV by default.
+# Media ranges with q=0 are refused by the client and skipped.
+def negotiate_format(accept: str) -> str:
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        media_type = media_type.strip().lower()
+        if media_type not in ACCEPT_FORMATS:
+            continue
+        refused = False
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    refused = float(value) == 0.0
+                except ValueError:
+                    pass
+        if not refused:
+            return ACCEPT_FORMATS[media_type]
+    return "wav"
+
+
+# Re-encodes the WAV from voicevox_core as FLAC or Ogg Opus.
+def encode_audio(wav_bytes: bytes, format: str) -> bytes:
+    data, rate = soundfile.read(io.BytesIO(wav_bytes), dtype="int16")
+    buf = io.BytesIO()
+    if format == "flac":
+        soundfile.write(buf, data, rate, format="FLAC")
+    else:
+        soundfile.write(buf, data, rate, format="OGG", subtype="OPUS")
+    return buf.getvalue()
+
+
+# Answers fixed GET endpoints (liveness probes) with prebuilt bodies before
+# the request reaches FastAPI's routing and dependency handling.
+class FastPathMiddleware:
+    def __init__(self, app, responses: Dict[str, bytes]):
+        self.app = app
+        self.responses = {
+            path: (
+                [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                body,
+            )
+            for path, body in responses.items()
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in self.responses:
+            headers, body = self.responses[scope["path"]]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+        await self.app(scope, receive, send)
+
+
+# Log records are formatted and written by a background thread so that
+# request handlers never block on stdout.
+def setup_logging(level: str) -> QueueListener:
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level.upper())
+    logger.propagate = False
+    return QueueListener(log_queue, handler)
 
 
 def generate_app(conf: AppConfig) -> FastAPI:
     app = FastAPI(
         title="VOICEVOX ENGINE",
         description="VOICEVOXの音声合成エンジンです。",
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -50,62 +353,165 @@ def generate_app(conf: AppConfig) -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    app.add_middleware(FastPathMiddleware, responses={"/hello": b'"hello"', "/healthz": b'"ok"'})
+    app.ready = False
+
+    log_listener = setup_logging(conf.log_level)
 
     @app.on_event("startup")
-    def start_core():
+    def start_logging():
+        log_listener.start()
+
+    @app.on_event("shutdown")
+    def stop_logging():
+        log_listener.stop()
+
+    # Loads the models and warms them up; run on the executor after startup.
+    def load_core(threads: int):
+        if conf.quant_mode:
+            os.environ["VV_MODELS_ROOT_DIR"] = os.path.join(conf.quant_model_root, f"model_{conf.quant_mode}")
         app.vvcore = VoicevoxCore(
-            acceleration_mode=AccelerationMode("AUTO"),
-            cpu_num_threads=conf.threads,
+            acceleration_mode=AccelerationMode(conf.acceleration_mode),
+            cpu_num_threads=threads,
             open_jtalk_dict_dir=conf.open_jtalk_dict_dir,
             load_all_models=True)
+        app.style_ids = frozenset(style.id for meta in app.vvcore.metas for style in meta.styles)
+        if conf.warmup:
+            tic = time.perf_counter()
+            if conf.warmup_speakers == "all":
+                speakers = sorted(app.style_ids)
+            else:
+                speakers = [int(spk) for spk in conf.warmup_speakers.split(",") if spk.strip()]
+            for speaker in speakers:
+                query = app.vvcore.audio_query("あ", speaker)
+                app.vvcore.synthesis(query, speaker)
+            logger.info("warmed up speakers %s in %.3fs", speakers, time.perf_counter() - tic)
+
+    async def start_serving(threads: int):
+        try:
+            await asyncio.get_running_loop().run_in_executor(app.executor, load_core, threads)
+        except Exception:
+            # /readyz keeps answering 503
+            logger.exception("failed to load voicevox_core")
+            return
+        app.batcher = SynthesisBatcher(app.vvcore, app.executor, app.workers, conf.max_batch)
+        app.batcher_task = asyncio.create_task(app.batcher.run())
+        app.ready = True
+
+    # uvicorn binds the socket only after every startup handler returns, so
+    # loading the models here would keep /readyz from ever answering 503.
+    # They are loaded by a background task instead and app.ready is set
+    # once it is done.
+    @app.on_event("startup")
+    async def start_core():
+        threads = conf.threads or available_cpus()
+        app.query_cache = AudioQueryCache(conf.query_cache_size)
+        # Every worker runs ONNX Runtime with `threads` intra-op threads, so
+        # more than cpus // threads workers would oversubscribe the CPUs.
+        app.workers = max(1, available_cpus() // threads)
+        app.executor = ThreadPoolExecutor(max_workers=app.workers)
+        app.inference_semaphore = asyncio.Semaphore(conf.max_concurrency or conf.max_batch)
+        app.in_flight = 0
+        app.max_in_flight = (conf.max_concurrency or conf.max_batch) + conf.max_queue
+        app.batcher_task = None
+        app.start_task = asyncio.create_task(start_serving(threads))
+
+    @app.on_event("shutdown")
+    async def stop_core():
+        app.start_task.cancel()
+        if app.batcher_task is not None:
+            app.batcher_task.cancel()
+        app.executor.shutdown(wait=False)
 
     @app.post(
         "/tts",
-        response_class=FileResponse,
+        response_class=Response,
         responses={
             200: {
                 "content": {
-                    "audio/wav": {"schema": {"type": "string", "format": "binary"}}
+                    "audio/wav": {"schema": {"type": "string", "format": "binary"}},
+                    "audio/L16": {"schema": {"type": "string", "format": "binary"}},
+                    "audio/flac": {"schema": {"type": "string", "format": "binary"}},
+                    "audio/ogg": {"schema": {"type": "string", "format": "binary"}},
                 },
             }
         },
         tags=["音声合成"],
         summary="音声合成する",
     )
-    def tts(body: TTSRequest):
+    async def tts(body: TTSRequest, request: Request):
         tic = time.perf_counter()
         text = body.text
         speaker = body.speaker
-        
-        query = app.vvcore.audio_query(text, speaker)
-        query.volume_scale = conf.volume_scale
-        query.pre_phoneme_length = conf.pre_phoneme_length
-        query.post_phoneme_length = conf.post_phoneme_length
-        query.speed_scale = body.speed * conf.base_speed_scale
-        print(body.text, ":", query)
-        wave = app.vvcore.synthesis(query, speaker)
-
-        with NamedTemporaryFile(delete=False) as f:
-            f.write(wave)
-
-        # stat
-        moras = 0
-        speech_length = query.pre_phoneme_length + query.post_phoneme_length
-        for phrase in query.accent_phrases:
-            moras += len(phrase.moras)
-            for m in phrase.moras:
-                if m.consonant_length is not None:
-                    speech_length += m.consonant_length
-                if m.vowel_length is not None:
-                    speech_length += m.vowel_length
-        speech_length /= query.speed_scale
-
-        toc = time.perf_counter()
-        proctime = toc - tic
-        print("PERF", f"moras={moras}", f"wavtime={speech_length:.3f}", f"proctime={proctime:.3f}", f"genrate={speech_length / proctime}", f"text={query.kana}")
-
-        return FileResponse(f.name, media_type="audio/wav")
+        if len(text) > conf.max_text_length:
+            raise HTTPException(status_code=413, detail="text too long")
+
+        if not app.ready:
+            raise HTTPException(status_code=503, detail="not ready")
+        if app.in_flight >= app.max_in_flight:
+            raise HTTPException(status_code=503, detail="too many requests in flight")
+        if speaker not in app.style_ids:
+            raise HTTPException(status_code=422, detail=f"unknown speaker: {speaker}")
+
+        format = body.format
+        if format is None:
+            format = negotiate_format(request.headers.get("accept", ""))
+
+        app.in_flight += 1
+        try:
+            async with app.inference_semaphore:
+                query = app.query_cache.get(text, speaker)
+                cache_hit = query is not None
+                if not cache_hit:
+                    query = await asyncio.get_running_loop().run_in_executor(
+                        app.executor, app.vvcore.audio_query, text, speaker
+                    )
+                    # cached queries have already passed this check
+                    if count_moras(query) > conf.max_moras:
+                        raise HTTPException(status_code=413, detail="too many moras")
+                    app.query_cache.put(text, speaker, query)
+                query.volume_scale = conf.volume_scale
+                query.pre_phoneme_length = conf.pre_phoneme_length
+                query.post_phoneme_length = conf.post_phoneme_length
+                query.speed_scale = body.speed * conf.base_speed_scale
+                logger.debug("query text=%s speaker=%d cache_hit=%s", text, speaker, cache_hit)
+                wav = await app.batcher.synthesis(query, speaker)
+                if format in MEDIA_TYPES:
+                    # Encoded by the inference pool within the admission bound,
+                    # so libFLAC/libopus never add threads beyond what it was sized for.
+                    audio = await asyncio.get_running_loop().run_in_executor(
+                        app.executor, encode_audio, wav, format
+                    )
+        finally:
+            app.in_flight -= 1
+
+        if conf.verbose_perf and logger.isEnabledFor(logging.INFO):
+            moras, speech_length = query_stats(query)
+            toc = time.perf_counter()
+            proctime = toc - tic
+            logger.info(
+                "PERF moras=%d wavtime=%.3f proctime=%.3f genrate=%s text=%s",
+                moras, speech_length, proctime, speech_length / proctime, query.kana,
+            )
+
+        headers = {"X-Cache": "HIT" if cache_hit else "MISS"}
+        if body.format is None:
+            headers["Vary"] = "Accept"
+        if format in MEDIA_TYPES:
+            return Response(content=audio, media_type=MEDIA_TYPES[format], headers=headers)
+        if format == "pcm":
+            rate, channels, pcm = wav_to_l16(wav)
+            return Response(content=pcm, media_type=f"audio/L16; rate={rate}; channels={channels}", headers=headers)
+        return Response(content=wav, media_type="audio/wav", headers=headers)
+
+
+    @app.get("/healthz", tags=["その他"])
+    def healthz() -> str:
+        return "ok"
 
+    @app.get("/readyz", tags=["その他"])
+    def readyz() -> Response:
+        return Response(status_code=200 if app.ready else 503)
 
     @app.get("/hello", tags=["その他"])
     def hello() -> str:
@@ -115,11 +521,13 @@ def generate_app(conf: AppConfig) -> FastAPI:
 
 
 if __name__ == "__main__":
-    conf = OmegaConf.structured(AppConfig())
-    print(OmegaConf.to_yaml(conf))
+    conf = AppConfig()
+    print(asdict(conf))
 
     uvicorn.run(
         generate_app(conf),
         host=conf.uvicorn_host,
         port=conf.uvicorn_port,
+        loop=conf.uvicorn_loop,
+        http=conf.uvicorn_http,
     )